@@ -1,5 +1,7 @@
+import asyncio
 import logging
 from datetime import timedelta
+from types import MappingProxyType
 
 import httpx
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -23,27 +25,35 @@ from .const import (
     PLATFORMS,
 )
 from .edp import EdpListener
-from .spc import SPCError, SPCSession
+from .spc import NOT_MODIFIED, SPCError, SPCSession
 
 LOGGER = logging.getLogger(__name__)
 
 # Map EDP event class codes to zone state mutations.
 # Each value is a dict merged into the zone's data.
-EDP_ZONE_EVENTS = {
-    "ZO": {"input": "open", "status": "actuated"},
-    "ZC": {"input": "closed", "status": "normal"},
-    "ZD": {"status": "tamper"},
-    "BA": {"status": "actuated"},
-    "BR": {"status": "normal"},
-    "FA": {"status": "actuated"},
-    "FR": {"status": "normal"},
-}
+EDP_ZONE_EVENTS = MappingProxyType({
+    "ZO": MappingProxyType({"input": "open", "status": "actuated"}),
+    "ZC": MappingProxyType({"input": "closed", "status": "normal"}),
+    "ZD": MappingProxyType({"status": "tamper"}),
+    "BA": MappingProxyType({"status": "actuated"}),
+    "BR": MappingProxyType({"status": "normal"}),
+    "FA": MappingProxyType({"status": "actuated"}),
+    "FR": MappingProxyType({"status": "normal"}),
+})
 
 # Map EDP event class codes to arm state values.
-EDP_ARM_EVENTS = {
+EDP_ARM_EVENTS = MappingProxyType({
     "CG": "fullset",
     "OG": "unset",
     "NL": "partset",
+})
+
+# Both of the above in one table: event class -> (kind, read-only patch).
+EDP_DISPATCH = {
+    **{cls: ("arm", MappingProxyType({"arm_state": arm_state}))
+       for cls, arm_state in EDP_ARM_EVENTS.items()},
+    **{cls: ("zone", patch)
+       for cls, patch in EDP_ZONE_EVENTS.items()},
 }
 
 
@@ -70,13 +80,46 @@ async def async_setup_entry(hass, entry):
     spc = SPCSession(url=url, userid=userid, password=password)
     await spc.login()
 
+    # Zones are kept in one dict that is updated in place by polls and EDP
+    # events. The version is bumped whenever a poll changes it, so that the
+    # coordinator still sees a different snapshot and notifies listeners.
+    zones = {}
+    version = 0
+
+    def merge_zones(polled_zones):
+        """Merge polled zones into the zones dict; returns True if it changed."""
+        changed = False
+        seen = set()
+        for zone in polled_zones:
+            zone_id = zone["zone_id"]
+            seen.add(zone_id)
+            current = zones.get(zone_id)
+            if current is None:
+                zones[zone_id] = zone
+                changed = True
+            elif current != zone:
+                current.update(zone)
+                changed = True
+        for zone_id in zones.keys() - seen:
+            del zones[zone_id]
+            changed = True
+        return changed
+
     async def update():
+        nonlocal version
         try:
-            return {
-                "arm_state": await spc.get_arm_state(),
-                "zones": {zone["zone_id"]: zone
-                          for zone in await spc.get_zones()},
-            }
+            results = await asyncio.gather(
+                spc.get_arm_state(),
+                spc.get_zones(),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    # Half of this poll may have succeeded; don't let the
+                    # next one treat its pages as unchanged.
+                    spc.clear_validators()
+                    raise result
+            arm_state, polled_zones = results
 
         except SPCError as e:
             # Treat as hard failure. Show unavailable.
@@ -85,16 +128,47 @@ async def async_setup_entry(hass, entry):
         except (httpx.HTTPError, ValueError) as e:
             raise UpdateFailed(f"SPC communication error: {e!s}") from e
 
+        data = coordinator.data
+        if data is None and (arm_state is NOT_MODIFIED
+                             or polled_zones is NOT_MODIFIED):
+            # Nothing to fall back on; fetch full pages next time.
+            spc.clear_validators()
+            raise UpdateFailed("SPC page not modified, but no data yet")
+
+        if arm_state is NOT_MODIFIED:
+            arm_state = data["arm_state"]
+        changed = (polled_zones is not NOT_MODIFIED
+                   and merge_zones(polled_zones))
+
+        # Nothing new: hand back the current snapshot itself, so the
+        # coordinator's comparison is trivial and no listeners run.
+        if not changed and data is not None and data["arm_state"] == arm_state:
+            return data
+
+        if changed:
+            version += 1
+
+        return {
+            "arm_state": arm_state,
+            "zones": zones,
+            "_version": version,
+        }
+
     coordinator = DataUpdateCoordinator(
         hass,
         LOGGER,
         config_entry=entry,
         name="SPC WebUI",
-        update_interval=poll_interval,
+        # EDP pushes state changes, so only poll when it's not configured.
+        update_interval=(None if edp_port > 0 else poll_interval),
         update_method=update,
         always_update=False,
     )
-    await coordinator.async_config_entry_first_refresh()
+    # Don't hold up Home Assistant startup on the panel; zone entities are
+    # added by add_zone_entities() once the first refresh is done.
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), "spc_webui first refresh",
+    )
 
     alarm_device_id = (DOMAIN, f"{spc.serial_number}-alarm")
     alarm_device_info = DeviceInfo({
@@ -105,51 +179,107 @@ async def async_setup_entry(hass, entry):
         "serial_number": spc.serial_number,
     })
 
+    # Every zone platform asks for the same device info; build it once.
+    zone_device_infos = {}
+
     def get_zone_device_info(zone):
-        return DeviceInfo({
-            "identifiers": {(DOMAIN, f"{spc.serial_number}-zone{zone["zone_id"]}")},
-            "name": f"Zone {zone["zone_id"]} {zone["zone_name"]}",
-            "manufacturer": MANUFACTURER,
-            "model": f"{spc.model} Zone",
-            "via_device": alarm_device_id,
-        })
+        zone_id = zone["zone_id"]
+        device_info = zone_device_infos.get(zone_id)
+        if device_info is None:
+            device_info = zone_device_infos[zone_id] = DeviceInfo({
+                "identifiers": {(DOMAIN, f"{spc.serial_number}-zone{zone_id}")},
+                "name": f"Zone {zone_id} {zone["zone_name"]}",
+                "manufacturer": MANUFACTURER,
+                "model": f"{spc.model} Zone",
+                "via_device": alarm_device_id,
+            })
+        return device_info
+
+    def add_zone_entities(async_add_entities, create_entity):
+        """Add an entity per zone, as soon as the zones are known."""
+        def add():
+            async_add_entities([
+                create_entity(zone)
+                for zone in coordinator.data["zones"].values()
+            ])
+
+        if coordinator.data is not None:
+            add()
+            return
+
+        remove_listener = None
+
+        def on_update():
+            if coordinator.data is not None:
+                stop_waiting()
+                add()
+
+        def stop_waiting():
+            nonlocal remove_listener
+            if remove_listener is not None:
+                remove_listener()
+                remove_listener = None
+
+        remove_listener = coordinator.async_add_listener(on_update)
+        entry.async_on_unload(stop_waiting)
 
     # Start EDP listener if configured.
     edp_listener = None
     if edp_port > 0:
-        def on_edp_event(event):
+        # EDP events are applied to the coordinator data in place, and
+        # listeners are notified once per batch.
+        def on_edp_events(events):
             data = coordinator.data
             if data is None:
+                # Nothing to apply the events to yet. The first refresh
+                # failed or is still running, and with EDP nothing polls,
+                # so ask for one now that the panel is talking to us.
+                entry.async_create_background_task(
+                    hass, coordinator.async_request_refresh(),
+                    "spc_webui EDP refresh",
+                )
                 return
 
-            cls = event.event_class
+            changed = False
+            for event in events:
+                cls = event.event_class
+                dispatch = EDP_DISPATCH.get(cls)
+                if dispatch is None:
+                    LOGGER.debug("EDP unhandled event class: %s", cls)
+                    continue
+                kind, patch = dispatch
 
-            if cls in EDP_ARM_EVENTS:
-                new_data = {**data, "arm_state": EDP_ARM_EVENTS[cls]}
-                coordinator.async_set_updated_data(new_data)
-                return
-
-            if cls in EDP_ZONE_EVENTS:
-                zone_id = event.device_id
-                zones = data.get("zones", {})
-                if zone_id in zones:
-                    updated_zone = {**zones[zone_id], **EDP_ZONE_EVENTS[cls]}
-                    new_zones = {**zones, zone_id: updated_zone}
-                    new_data = {**data, "zones": new_zones}
-                    coordinator.async_set_updated_data(new_data)
+                if kind == "arm":
+                    data.update(patch)
                 else:
-                    LOGGER.debug(
-                        "EDP event for unknown zone %d (class=%s)",
-                        zone_id, cls,
-                    )
-                return
+                    zone_id = event.device_id
+                    zone = data["zones"].get(zone_id)
+                    if zone is None:
+                        LOGGER.debug(
+                            "EDP event for unknown zone %d (class=%s)",
+                            zone_id, cls,
+                        )
+                        continue
+                    zone.update(patch)
+                changed = True
 
-            LOGGER.debug("EDP unhandled event class: %s", cls)
+            if changed:
+                # The data no longer matches the pages last fetched, so a
+                # "not modified" reply can't vouch for it anymore.
+                spc.clear_validators()
+                coordinator.async_set_updated_data(data)
 
         edp_listener = EdpListener(
             port=edp_port,
             system_id=edp_system_id,
-            callback=on_edp_event,
+            callback=on_edp_events,
+            # Resync from the WebUI if the panel goes quiet. With EDP the
+            # poll interval isn't used for polling; instead it means "resync
+            # after twice this long without packets".
+            timeout=2 * poll_interval.total_seconds(),
+            timeout_callback=lambda: entry.async_create_background_task(
+                hass, coordinator.async_request_refresh(), "spc_webui EDP resync",
+            ),
         )
         await edp_listener.start()
 
@@ -159,6 +289,7 @@ async def async_setup_entry(hass, entry):
         "coordinator": coordinator,
         "alarm_device_info": alarm_device_info,
         "get_zone_device_info": get_zone_device_info,
+        "add_zone_entities": add_zone_entities,
         "unique_prefix": f"spc{spc.serial_number}",
         "edp_listener": edp_listener,
     }
@@ -10,6 +10,13 @@ from .const import DOMAIN
 from .spc import SPCError
 
 
+ALARM_STATE = {
+    "unset": AlarmControlPanelState.DISARMED,
+    "fullset": AlarmControlPanelState.ARMED_AWAY,
+    "partset": AlarmControlPanelState.ARMED_NIGHT,
+}
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up SPC alarm control panel entity from a config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
@@ -51,12 +58,10 @@ class SPCAlarm(CoordinatorEntity, AlarmControlPanelEntity):
 
     @property
     def alarm_state(self):
-        arm_state = self.coordinator.data["arm_state"]
-        return {
-            "unset": AlarmControlPanelState.DISARMED,
-            "fullset": AlarmControlPanelState.ARMED_AWAY,
-            "partset": AlarmControlPanelState.ARMED_NIGHT,
-        }.get(arm_state)
+        if self.coordinator.data is None:
+            # First refresh not done yet.
+            return None
+        return ALARM_STATE.get(self.coordinator.data["arm_state"])
 
     async def _async_set_arm_state(self, arm_state):
         try:
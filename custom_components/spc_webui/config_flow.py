@@ -14,7 +14,7 @@ from .const import (
     DEFAULT_POLL_INTERVAL,
     DOMAIN,
 )
-from .spc import SPCLoginError, SPCSession
+from .spc import SPCLoginError, SPCSession, create_client
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
@@ -33,6 +33,26 @@ class SPCWebUIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self):
+        # Kept across validation attempts so that retrying with corrected
+        # credentials reuses the connection instead of a new TLS handshake.
+        self._client = None
+        self._client_url = None
+
+    async def _async_get_client(self, url):
+        if self._client is not None and self._client_url != url:
+            await self._async_close_client()
+        if self._client is None:
+            self._client = create_client(url)
+            self._client_url = url
+        return self._client
+
+    async def _async_close_client(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_url = None
+
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is not None:
@@ -43,17 +63,21 @@ class SPCWebUIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             edp_port = user_input.get(CONF_EDP_PORT, DEFAULT_EDP_PORT)
             edp_system_id = user_input.get(CONF_EDP_SYSTEM_ID, DEFAULT_EDP_SYSTEM_ID)
 
-            spc = SPCSession(url=url, userid=userid, password=password)
+            spc = SPCSession(
+                url=url,
+                userid=userid,
+                password=password,
+                client=await self._async_get_client(url),
+            )
             try:
                 await spc.login()
             except SPCLoginError:
                 errors["base"] = "invalid_auth"
             except Exception:
                 errors["base"] = "cannot_connect"
-            finally:
-                await spc.aclose()
 
             if not errors:
+                await self._async_close_client()
                 await self.async_set_unique_id(spc.serial_number)
 
                 return self.async_create_entry(
@@ -74,6 +98,14 @@ class SPCWebUIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    @callback
+    def async_remove(self):
+        """Close the client if the flow is aborted."""
+        if self._client is not None:
+            self.hass.async_create_task(self._client.aclose())
+            self._client = None
+            self._client_url = None
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
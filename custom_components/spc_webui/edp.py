@@ -1,5 +1,10 @@
 import asyncio
+import calendar
+import functools
 import logging
+import re
+import socket
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
@@ -8,37 +13,94 @@ LOGGER = logging.getLogger(__name__)
 # EDP binary header is 23 bytes; text payload follows.
 EDP_HEADER_SIZE = 23
 
+# Receive buffer for the UDP socket, so that bursts of events (e.g. when
+# arming) are not dropped. The kernel may cap this (net.core.rmem_max).
+EDP_RECV_BUFFER_SIZE = 1 << 20
+
+# Parsed events waiting to be handed to the callback. When full, the
+# oldest event is dropped.
+EDP_QUEUE_SIZE = 1024
+
+# How long to collect further events after the first one, in seconds.
+# The socket delivers one datagram per event loop iteration, so without
+# this wait every batch would hold just a single event.
+EDP_BATCH_DELAY = 0.05
+
 # The broken-bar character used as sub-delimiter in field 4.
 SUB_DELIM = "\xa6"  # ¦
 
-
-@dataclass
+# What str.strip() removes from decoded ISO-8859-1 text, for stripping
+# the raw bytes the same way.
+WHITESPACE = b"\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0"
+
+# EDP text payload: optional brackets around "|"-delimited fields. Matched
+# as bytes so that only the name field has to be decoded. Any fields past
+# the name are ignored. The outer whitespace is the WHITESPACE set, not
+# \s, which only covers ASCII in bytes patterns. The closing bracket is
+# stripped by the caller; a lazy name group that leaves it out is several
+# times slower to match.
+RE_EDP_MESSAGE = re.compile(
+    rb"[\t-\r\x1c-\x20\x85\xa0]*\[?"
+    rb"(?P<system_id>[^|]*)\|"
+    rb"(?P<timestamp>[^|]*)\|"
+    rb"(?P<event_class>[^|]*)\|"
+    rb"(?P<device_id>[^|]*)\|"
+    rb"(?P<name>[^|]*)"
+    rb"(?P<rest>\|.*)?",
+    re.DOTALL
+)
+
+
+@dataclass(slots=True)
 class EdpEvent:
     system_id: int
-    timestamp: datetime
+    timestamp_unix: float
     event_class: str
     device_id: int
     device_name: str
     area_id: int | None = None
     area_name: str | None = None
 
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_unix, tz=timezone.utc)
+
 
 def _to_utf8(data: bytes) -> str:
     """Decode ISO-8859-1 bytes to a Python str (effectively Latin-1 → UTF-8)."""
     return data.decode("iso-8859-1")
 
 
-def _parse_timestamp(ts: str) -> datetime:
-    """Parse EDP timestamp format HHMMSSDDMMYYYYr → datetime (UTC)."""
-    # Example: "21155703112020" → 2020-11-03 21:15:57
-    try:
-        return datetime.strptime(ts[:14], "%H%M%S%d%m%Y").replace(tzinfo=timezone.utc)
-    except ValueError:
-        return datetime.now(timezone.utc)
-
-
-def _parse_name_field(raw: str) -> tuple[str, int | None, str | None]:
-    """Parse the sub-delimited name field.
+# Events from one burst share their timestamp.
+@functools.lru_cache(maxsize=64)
+def _timestamp_from_digits(ts: bytes) -> float | None:
+    # Fixed-width digits, so slice them instead of going through strptime.
+    if len(ts) >= 14 and ts[:14].isdigit():
+        year, month, day = int(ts[10:14]), int(ts[8:10]), int(ts[6:8])
+        hour, minute, second = int(ts[0:2]), int(ts[2:4]), int(ts[4:6])
+        # timegm() doesn't validate, it would shift e.g. Feb 31 into March.
+        if (year >= 1 and 1 <= month <= 12
+                and 1 <= day <= calendar.monthrange(year, month)[1]
+                and hour < 24 and minute < 60 and second < 60):
+            return float(calendar.timegm(
+                (year, month, day, hour, minute, second, 0, 0, 0)
+            ))
+    return None
+
+
+def _parse_timestamp(ts: bytes) -> float:
+    """Parse EDP timestamp format HHMMSSDDMMYYYYr → Unix time (UTC)."""
+    # Example: b"21155703112020" → 2020-11-03 21:15:57
+    timestamp = _timestamp_from_digits(ts)
+    if timestamp is None:
+        return time.time()
+    return timestamp
+
+
+# Name fields repeat verbatim for every event from the same zone/area.
+@functools.lru_cache(maxsize=4096)
+def _parse_name_field(raw: bytes) -> tuple[str, int | None, str | None]:
+    """Decode and parse the sub-delimited name field.
 
     Returns (device_name, area_id, area_name).
 
@@ -47,33 +109,53 @@ def _parse_name_field(raw: str) -> tuple[str, int | None, str | None]:
       Area events:  "AreaName¦UserName¦AreaID"
       System events: "Description¦ID"
     """
-    parts = raw.split(SUB_DELIM)
+    raw = _to_utf8(raw)
+
+    # partition() instead of split() so that we only cut as many parts as
+    # the detected format needs.
+    first, sep, rest = raw.partition(SUB_DELIM)
+    if not sep:
+        return raw.strip(), None, None
 
-    if len(parts) >= 4 and parts[1] == "ZONE":
+    second, sep, rest = rest.partition(SUB_DELIM)
+    if not sep:
+        # System event: Description ¦ ID
+        return first.strip(), None, None
+
+    third, sep, rest = rest.partition(SUB_DELIM)
+    if sep and second == "ZONE":
         # Zone event: DeviceName ¦ ZONE ¦ AreaID ¦ AreaName
-        device_name = parts[0].strip()
+        device_name = first.strip()
         try:
-            area_id = int(parts[2])
+            area_id = int(third)
         except ValueError:
             area_id = None
-        area_name = parts[3].strip() if len(parts) > 3 else None
+        area_name = rest.partition(SUB_DELIM)[0].strip()
         return device_name, area_id, area_name
 
-    if len(parts) >= 3:
-        # Area/user event: AreaName ¦ UserName ¦ AreaID
-        area_name = parts[0].strip()
-        device_name = parts[1].strip()
-        try:
-            area_id = int(parts[2])
-        except ValueError:
-            area_id = None
-        return device_name, area_id, area_name
+    # Area/user event: AreaName ¦ UserName ¦ AreaID
+    area_name = first.strip()
+    device_name = second.strip()
+    try:
+        area_id = int(third)
+    except ValueError:
+        area_id = None
+    return device_name, area_id, area_name
 
-    if len(parts) == 2:
-        # System event: Description ¦ ID
-        return parts[0].strip(), None, None
 
-    return raw.strip(), None, None
+def _peek_system_id(data: bytes) -> int | None:
+    """Read the system ID from a raw EDP packet without parsing the rest.
+
+    Returns None if it cannot be determined.
+    """
+    end = data.find(b"|", EDP_HEADER_SIZE)
+    if end < 0:
+        return None
+    raw = data[EDP_HEADER_SIZE:end].lstrip(WHITESPACE).removeprefix(b"[")
+    try:
+        return int(_to_utf8(raw.removeprefix(b"#")))
+    except ValueError:
+        return None
 
 
 def parse_edp_message(data: bytes) -> EdpEvent:
@@ -84,41 +166,39 @@ def parse_edp_message(data: bytes) -> EdpEvent:
     if len(data) < EDP_HEADER_SIZE + 5:
         raise ValueError(f"EDP packet too short: {len(data)} bytes")
 
-    text = _to_utf8(data[EDP_HEADER_SIZE:])
+    # Fields are decoded before strip()/int()/upper() so that they behave
+    # exactly as on the decoded text. Match in place past the header rather
+    # than slicing off a copy.
+    m = RE_EDP_MESSAGE.match(data, EDP_HEADER_SIZE)
+    if not m:
+        payload = data[EDP_HEADER_SIZE:].strip(WHITESPACE)
+        payload = payload.removeprefix(b"[").removesuffix(b"]")
+        raise ValueError(f"EDP message has too few fields: {_to_utf8(payload)!r}")
 
-    # Strip leading '[' and trailing ']'
-    text = text.strip()
-    if text.startswith("["):
-        text = text[1:]
-    if text.endswith("]"):
-        text = text[:-1]
-
-    fields = text.split("|")
-    if len(fields) < 5:
-        raise ValueError(f"EDP message has too few fields: {text!r}")
+    system_id_raw, timestamp_raw, event_class_raw, device_id_raw, name, rest = m.groups()
+    if rest is None:
+        # The name is the last field, so the closing bracket is in it.
+        name = name.rstrip(WHITESPACE).removesuffix(b"]")
 
     # Field 0: "#SYSTEMID"
-    system_id_str = fields[0]
-    if system_id_str.startswith("#"):
-        system_id_str = system_id_str[1:]
     try:
-        system_id = int(system_id_str)
+        system_id = int(_to_utf8(system_id_raw.removeprefix(b"#")))
     except ValueError:
-        raise ValueError(f"EDP invalid system ID: {fields[0]!r}")
+        raise ValueError(f"EDP invalid system ID: {_to_utf8(system_id_raw)!r}")
 
-    timestamp = _parse_timestamp(fields[1])
-    event_class = fields[2].strip().upper()
+    timestamp_unix = _parse_timestamp(timestamp_raw)
+    event_class = _to_utf8(event_class_raw).strip().upper()
 
     try:
-        device_id = int(fields[3])
+        device_id = int(_to_utf8(device_id_raw))
     except ValueError:
-        raise ValueError(f"EDP invalid device ID: {fields[3]!r}")
+        raise ValueError(f"EDP invalid device ID: {_to_utf8(device_id_raw)!r}")
 
-    device_name, area_id, area_name = _parse_name_field(fields[4])
+    device_name, area_id, area_name = _parse_name_field(name)
 
     return EdpEvent(
         system_id=system_id,
-        timestamp=timestamp,
+        timestamp_unix=timestamp_unix,
         event_class=event_class,
         device_id=device_id,
         device_name=device_name,
@@ -128,32 +208,47 @@ def parse_edp_message(data: bytes) -> EdpEvent:
 
 
 class _EdpProtocol(asyncio.DatagramProtocol):
-    """asyncio UDP protocol that parses EDP packets."""
+    """asyncio UDP protocol that parses EDP packets into a queue."""
 
-    def __init__(self, system_id: int, callback):
+    def __init__(self, system_id: int, queue: asyncio.Queue):
         self._system_id = system_id
-        self._callback = callback
+        self._queue = queue
+        self.last_received = time.monotonic()
+        self.closed = asyncio.get_running_loop().create_future()
 
     def datagram_received(self, data: bytes, addr: tuple):
+        # Drop packets from other systems before doing the full parse.
+        if self._system_id:
+            system_id = _peek_system_id(data)
+            if system_id is not None and system_id != self._system_id:
+                LOGGER.debug(
+                    "EDP ignoring system %d (expecting %d)",
+                    system_id, self._system_id,
+                )
+                return
+
+        self.last_received = time.monotonic()
+
         try:
             event = parse_edp_message(data)
         except ValueError as e:
             LOGGER.warning("EDP parse error from %s: %s", addr, e)
             return
 
-        if self._system_id and event.system_id != self._system_id:
-            LOGGER.debug(
-                "EDP ignoring system %d (expecting %d)",
-                event.system_id, self._system_id,
-            )
-            return
-
         LOGGER.debug(
             "EDP event: class=%s device=%d (%s) area=%s",
             event.event_class, event.device_id, event.device_name,
             event.area_id,
         )
-        self._callback(event)
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            dropped = self._queue.get_nowait()
+            self._queue.put_nowait(event)
+            LOGGER.warning(
+                "EDP queue full, dropped event: class=%s device=%d",
+                dropped.event_class, dropped.device_id,
+            )
 
     def error_received(self, exc):
         LOGGER.warning("EDP socket error: %s", exc)
@@ -161,29 +256,94 @@ class _EdpProtocol(asyncio.DatagramProtocol):
     def connection_lost(self, exc):
         if exc:
             LOGGER.warning("EDP connection lost: %s", exc)
+        if not self.closed.done():
+            self.closed.set_result(None)
 
 
 class EdpListener:
-    """Manages a UDP socket that receives EDP events from the SPC panel."""
+    """Manages a UDP socket that receives EDP events from the SPC panel.
+
+    Events are queued as they arrive and passed to callback as a list
+    from a separate task. After the first event, the task waits
+    EDP_BATCH_DELAY for more, so a burst of events results in a single
+    callback. The callback still runs on the event loop.
 
-    def __init__(self, port: int, system_id: int, callback):
+    If timeout is given, timeout_callback is called whenever no packets
+    have been received from the panel for that many seconds.
+    """
+
+    def __init__(self, port: int, system_id: int, callback,
+                 timeout: float | None = None, timeout_callback=None):
         self._port = port
         self._system_id = system_id
         self._callback = callback
+        self._timeout = timeout
+        self._timeout_callback = timeout_callback
         self._transport = None
+        self._protocol = None
+        self._watchdog = None
+        self._worker = None
 
     async def start(self):
         """Bind the UDP socket and start receiving."""
         loop = asyncio.get_running_loop()
-        self._transport, _ = await loop.create_datagram_endpoint(
-            lambda: _EdpProtocol(self._system_id, self._callback),
-            local_addr=("0.0.0.0", self._port),
-        )
+        queue = asyncio.Queue(maxsize=EDP_QUEUE_SIZE)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, EDP_RECV_BUFFER_SIZE)
+            sock.setblocking(False)
+            sock.bind(("0.0.0.0", self._port))
+            self._transport, self._protocol = await loop.create_datagram_endpoint(
+                lambda: _EdpProtocol(self._system_id, queue),
+                sock=sock,
+            )
+        except BaseException:
+            sock.close()
+            raise
+
+        self._worker = loop.create_task(self._drain(queue), name="EDP listener")
+        if self._timeout and self._timeout_callback:
+            self._watchdog = loop.call_later(self._timeout, self._check_timeout)
         LOGGER.info("EDP listener started on UDP port %d", self._port)
 
+    async def _drain(self, queue: asyncio.Queue):
+        while True:
+            events = [await queue.get()]
+            await asyncio.sleep(EDP_BATCH_DELAY)
+            while not queue.empty():
+                events.append(queue.get_nowait())
+            try:
+                self._callback(events)
+            except Exception:
+                LOGGER.exception("EDP event callback failed")
+
+    def _check_timeout(self):
+        idle = time.monotonic() - self._protocol.last_received
+        if idle >= self._timeout:
+            LOGGER.debug("EDP no packets for %.0f seconds", idle)
+            # Start a new period so the callback fires again only if the
+            # panel stays silent for another full timeout.
+            self._protocol.last_received = time.monotonic()
+            self._timeout_callback()
+            delay = self._timeout
+        else:
+            delay = self._timeout - idle
+        loop = asyncio.get_running_loop()
+        self._watchdog = loop.call_later(delay, self._check_timeout)
+
     async def stop(self):
         """Close the UDP socket."""
+        if self._watchdog:
+            self._watchdog.cancel()
+            self._watchdog = None
         if self._transport:
             self._transport.close()
+            # The socket is only closed once connection_lost() has run;
+            # wait for it so that the port can be bound again right away.
+            await self._protocol.closed
             self._transport = None
+            self._protocol = None
             LOGGER.info("EDP listener stopped")
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
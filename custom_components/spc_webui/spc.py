@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import re
 import ssl
@@ -59,6 +60,9 @@ RE_ZONE = re.compile(
 
 LOGGER = logging.getLogger(__name__)
 
+# Returned by getters when the page hasn't changed since it was last fetched.
+NOT_MODIFIED = object()
+
 
 def get_ssl_context():
     """
@@ -102,6 +106,26 @@ def normalize_url(url, default_scheme="https"):
     return url
 
 
+def create_client(url):
+    """
+    HTTPX client for talking to the SPC panel at the given URL.
+
+    The connection is kept alive between polls so that each request
+    doesn't pay for a new (slow, legacy) TLS handshake.
+    """
+
+    return httpx.AsyncClient(
+        base_url=normalize_url(url),
+        verify=get_ssl_context(),
+        timeout=httpx.Timeout(10.0),
+        limits=httpx.Limits(
+            max_connections=2,
+            max_keepalive_connections=2,
+            keepalive_expiry=75.0,
+        ),
+    )
+
+
 def parse_title(html):
     """Return [model, site] parsed from the HTML title, falling back to blanks."""
     re_match = RE_TITLE.search(html)
@@ -186,33 +210,34 @@ class SPCCommandError(SPCError):
 class SPCSession:
     """Async helper around the SPC WebUI session workflow and HTML parsing."""
 
-    def __init__(self, url, userid, password):
+    def __init__(self, url, userid, password, client=None):
         self._userid = userid
         self._password = password
 
-        self.client = httpx.AsyncClient(
-            base_url=normalize_url(url),
-            verify=get_ssl_context(),
-            timeout=httpx.Timeout(10.0),
-            limits=httpx.Limits(
-                max_connections=1,
-                max_keepalive_connections=0,
-            ),
-        )
+        # A client passed in by the caller is shared and not closed by us.
+        self._owns_client = (client is None)
+        self.client = (create_client(url) if client is None else client)
 
         self.creds = {
             "userid": userid,
             "password": password,
         }
 
+        # Concurrent requests that hit the login page log in only once.
+        self._login_lock = asyncio.Lock()
+
+        # Page -> conditional request headers from the last response.
+        self._validators = {}
+
         self.sid = ""
         self.model = ""
         self.serial_number = ""
         self.site = ""
 
     async def aclose(self):
-        """Close the underlying HTTPX client."""
-        await self.client.aclose()
+        """Close the underlying HTTPX client, unless it was passed in."""
+        if self._owns_client:
+            await self.client.aclose()
 
     def _get_secure_url(self, page, update=False):
         action = ("&action=update" if update else "")
@@ -224,12 +249,39 @@ class SPCSession:
         self.model, self.site = parse_title(html)
         return html
 
+    async def _get_page(self, page):
+        """GET a secure page; returns None if it hasn't changed since last time."""
+        async def do():
+            url = self._get_secure_url(page)
+            resp = await self.client.get(url, headers=self._validators.get(page))
+            if resp.status_code == httpx.codes.NOT_MODIFIED:
+                return None
+            html = self._get_html(resp)
+
+            validators = {}
+            if etag := resp.headers.get("ETag"):
+                validators["If-None-Match"] = etag
+            if last_modified := resp.headers.get("Last-Modified"):
+                validators["If-Modified-Since"] = last_modified
+            self._validators[page] = validators
+            return html
+
+        return await self._do_with_login(do)
+
+    def clear_validators(self):
+        """Forget cached ETags etc. so the next getters fetch full pages."""
+        self._validators.clear()
+
     async def _do_with_login(self, do):
-        if self.sid:
+        sid = self.sid
+        if sid:
             html = await do()
-            if not is_login_page(html):
+            if html is None or not is_login_page(html):
                 return html
-        await self.login()
+        async with self._login_lock:
+            # Someone else may have logged in while we were waiting.
+            if self.sid == sid:
+                await self.login()
         return await do()
 
     async def login(self):
@@ -245,15 +297,14 @@ class SPCSession:
 
         self.sid = parse_session_id(html)
         self.serial_number = parse_serial_number(html)
+        # Anything cached before may have been the login page.
+        self.clear_validators()
 
     async def get_arm_state(self):
-        """Fetch current global arm state."""
-        async def do():
-            url = self._get_secure_url("system_summary")
-            resp = await self.client.get(url)
-            return self._get_html(resp)
-
-        html = await self._do_with_login(do)
+        """Fetch current global arm state, or NOT_MODIFIED."""
+        html = await self._get_page("system_summary")
+        if html is None:
+            return NOT_MODIFIED
         return parse_arm_state(html)
 
     async def set_arm_state(self, arm_state):
@@ -281,13 +332,10 @@ class SPCSession:
         return parse_arm_state(html)
 
     async def get_zones(self):
-        """Fetch a list of zones."""
-        async def do():
-            url = self._get_secure_url("status_zones")
-            resp = await self.client.get(url)
-            return self._get_html(resp)
-
-        html = await self._do_with_login(do)
+        """Fetch a list of zones, or NOT_MODIFIED."""
+        html = await self._get_page("status_zones")
+        if html is None:
+            return NOT_MODIFIED
         return list(parse_zones(html))
 
     async def set_zone_inhibit(self, zone_id, inhibit):
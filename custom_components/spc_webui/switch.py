@@ -13,18 +13,19 @@ async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = data["coordinator"]
     spc = data["spc"]
     get_zone_device_info = data["get_zone_device_info"]
+    add_zone_entities = data["add_zone_entities"]
     unique_prefix = data["unique_prefix"]
 
-    async_add_entities([
-        SPCZoneInhibit(
+    def create_entity(zone):
+        return SPCZoneInhibit(
             coordinator=coordinator,
             spc=spc,
             device_info=get_zone_device_info(zone),
             unique_prefix=unique_prefix,
             zone=zone,
         )
-        for zone in coordinator.data["zones"].values()
-    ])
+
+    add_zone_entities(async_add_entities, create_entity)
 
 
 class SPCZoneInhibit(CoordinatorEntity, SwitchEntity):